@@ -11,15 +11,13 @@ from pathlib import Path
 # Add src to path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from utils import *
-import json
-from datetime import datetime
-
 
 def test_filename_cleaning():
     """Test filename cleaning functionality."""
     print("\n=== Testing Filename Cleaning ===")
 
+    from utils.formatters import clean_filename
+
     test_cases = [
         "invoice__FINAL_v2 (1) - Copy.pdf",
         "ScreenShot 2024-03-15 at 2.34.56 PM.png",
@@ -31,15 +29,23 @@ def test_filename_cleaning():
         "my/file\\with:invalid*chars?.doc",
     ]
 
+    out = []
     for filename in test_cases:
         cleaned = clean_filename(filename)
-        print(f"Original: {filename:50} → Cleaned: {cleaned}")
+        out.append(f"Original: {filename:50} → Cleaned: {cleaned}\n")
+    sys.stdout.write("".join(out))
 
 
 def test_file_validation():
     """Test file validation functionality."""
     print("\n\n=== Testing File Validation ===")
 
+    from utils.validators import (
+        ValidationError,
+        is_supported_file_type,
+        validate_filename,
+    )
+
     # Test filename validation
     test_names = [
         ("normal_file.pdf", True),
@@ -49,6 +55,7 @@ def test_file_validation():
         ("a" * 300 + ".txt", False),  # Too long
     ]
 
+    out = []
     for filename, should_pass in test_names:
         try:
             validate_filename(filename)
@@ -56,7 +63,8 @@ def test_file_validation():
         except ValidationError as e:
             result = f"✗ Invalid: {e}"
 
-        print(f"Filename: {filename:30} → {result}")
+        out.append(f"Filename: {filename:30} → {result}\n")
+    sys.stdout.write("".join(out))
 
     # Test supported file types
     print("\n--- Supported File Types ---")
@@ -69,16 +77,20 @@ def test_file_validation():
         "video.mp4",
     ]
 
+    out = []
     for file in test_files:
         path = Path(file)
         supported = is_supported_file_type(path)
-        print(f"{file:20} → {'✓ Supported' if supported else '✗ Not supported'}")
+        out.append(f"{file:20} → {'✓ Supported' if supported else '✗ Not supported'}\n")
+    sys.stdout.write("".join(out))
 
 
 def test_organization_paths():
     """Test organization path building."""
     print("\n\n=== Testing Organization Path Building ===")
 
+    from utils.helpers import build_organized_path
+
     base_dir = Path("dev_folders/organized/Documents")
 
     # Test different organization strategies
@@ -106,6 +118,7 @@ def test_organization_paths():
         },
     ]
 
+    out = []
     for example in examples:
         path = build_organized_path(
             base_dir=base_dir,
@@ -114,14 +127,19 @@ def test_organization_paths():
             filename=example["filename"],
             date_based=example["date_based"],
         )
-        print(f"\n{example['desc']}:")
-        print(f"  → {path}")
+        out.append(f"\n{example['desc']}:\n  → {path}\n")
+    sys.stdout.write("".join(out))
 
 
 def test_descriptive_filenames():
     """Test descriptive filename generation."""
     print("\n\n=== Testing Descriptive Filename Generation ===")
 
+    import json
+    from datetime import datetime
+
+    from utils.formatters import create_descriptive_filename
+
     test_cases = [
         {
             "document_type": "invoice",
@@ -144,22 +162,32 @@ def test_descriptive_filenames():
         },
     ]
 
+    out = []
     for case in test_cases:
         filename = create_descriptive_filename(
             document_type=case["document_type"],
             entities=case["entities"],
             original_name=case["original"],
         )
-        print(f"\nOriginal: {case['original']}")
-        print(f"Type: {case['document_type']}")
-        print(f"Entities: {json.dumps(case['entities'], default=str, indent=2)}")
-        print(f"Generated: {filename}")
+        out.append(f"\nOriginal: {case['original']}\n")
+        out.append(f"Type: {case['document_type']}\n")
+        out.append(f"Entities: {json.dumps(case['entities'], default=str, indent=2)}\n")
+        out.append(f"Generated: {filename}\n")
+    sys.stdout.write("".join(out))
 
 
 def test_file_operations():
     """Test file operations in dev folders."""
     print("\n\n=== Testing File Operations ===")
 
+    from utils.helpers import (
+        FileOperationError,
+        create_test_file,
+        ensure_directory,
+        get_file_metadata,
+        safe_move_file,
+    )
+
     # Create test files
     test_dir = Path("dev_folders/watched/downloads")
     ensure_directory(test_dir)
@@ -171,9 +199,10 @@ def test_file_operations():
 
     # Get file metadata
     metadata = get_file_metadata(created_file)
-    print(f"\nFile Metadata:")
-    for key, value in metadata.items():
-        print(f"  {key}: {value}")
+    sys.stdout.write(
+        "\nFile Metadata:\n"
+        + "".join(f"  {key}: {value}\n" for key, value in metadata.items())
+    )
 
     # Test safe move
     dest_dir = Path("dev_folders/organized/Documents/Tests")
@@ -190,15 +219,18 @@ def test_formatting_helpers():
     """Test various formatting helpers."""
     print("\n\n=== Testing Formatting Helpers ===")
 
+    from utils.formatters import format_time_ago, humanize_file_size
+
     # Test file size formatting
     sizes = [500, 1024, 1048576, 1073741824, 1099511627776]
-    print("\nFile Sizes:")
-    for size in sizes:
-        print(f"  {size:15,} bytes → {humanize_file_size(size)}")
+    sys.stdout.write(
+        "\nFile Sizes:\n"
+        + "".join(f"  {size:15,} bytes → {humanize_file_size(size)}\n" for size in sizes)
+    )
 
     # Test time formatting
     print("\nTime Formatting:")
-    from datetime import timedelta
+    from datetime import datetime, timedelta
 
     now = datetime.now()
 
@@ -210,9 +242,9 @@ def test_formatting_helpers():
         (now - timedelta(days=7), "a week ago"),
     ]
 
-    for time, desc in times:
-        formatted = format_time_ago(time)
-        print(f"  {desc:20} → {formatted}")
+    sys.stdout.write(
+        "".join(f"  {desc:20} → {format_time_ago(time)}\n" for time, desc in times)
+    )
 
 
 def main():
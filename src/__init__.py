@@ -5,11 +5,31 @@ An intelligent file organization system that runs quietly in the background,
 automatically organizing your digital mess into a perfectly structured file system.
 """
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "Alfred Team"
 
-# Make key modules easily accessible
-from . import utils
-from .config import config
-
 __all__ = ["utils", "config", "__version__"]
+
+
+def __getattr__(name):
+    """Lazily resolve submodules on first access (PEP 562).
+
+    Keeps `import src` cheap - consumers that only need a single utility
+    don't pay for loading config (dotenv) or the full utils package.
+    """
+    if name == "utils":
+        module = importlib.import_module(".utils", __name__)
+        globals()[name] = module
+        return module
+    if name == "config":
+        module = importlib.import_module(".config", __name__)
+        value = module.config
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,100 @@
+"""
+_constants.py - Static, immutable tables for Alfred
+
+Frozen at module load so they can be shared freely: membership tests hit
+the frozenset fast path and nothing downstream can mutate them.
+"""
+
+from types import MappingProxyType
+
+SUPPORTED_EXTENSIONS = frozenset(
+    {
+        # Documents
+        ".pdf",
+        ".doc",
+        ".docx",
+        ".txt",
+        ".rtf",
+        ".odt",
+        # Spreadsheets
+        ".xls",
+        ".xlsx",
+        ".csv",
+        ".ods",
+        # Presentations
+        ".ppt",
+        ".pptx",
+        ".odp",
+        # Images
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".bmp",
+        ".svg",
+        ".webp",
+        # Data files
+        ".json",
+        ".xml",
+        ".yaml",
+        ".yml",
+        # Archives
+        ".zip",
+        # Common formats
+        ".md",
+        ".log",
+    }
+)
+
+# File categories keyed by the extensions they cover
+FILE_CATEGORIES = MappingProxyType(
+    {
+        "document": frozenset({".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"}),
+        "spreadsheet": frozenset({".xls", ".xlsx", ".csv", ".ods"}),
+        "presentation": frozenset({".ppt", ".pptx", ".odp"}),
+        "image": frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"}),
+        "video": frozenset({".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv"}),
+        "audio": frozenset({".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma"}),
+        "archive": frozenset({".zip", ".rar", ".7z", ".tar", ".gz", ".bz2"}),
+        "code": frozenset(
+            {".py", ".js", ".java", ".cpp", ".c", ".html", ".css", ".json", ".xml"}
+        ),
+        "data": frozenset({".json", ".xml", ".yaml", ".yml", ".sql"}),
+    }
+)
+
+# Inverted index for O(1) extension-to-category lookup. setdefault keeps
+# the first category that claims an extension (.json/.xml stay "code"),
+# matching the old linear scan order.
+_ext_to_category = {}
+for _category, _extensions in FILE_CATEGORIES.items():
+    for _ext in _extensions:
+        _ext_to_category.setdefault(_ext, _category)
+EXTENSION_CATEGORIES = MappingProxyType(_ext_to_category)
+del _ext_to_category, _category, _extensions, _ext
+
+# Alfred personality settings
+ALFRED_RESPONSES = MappingProxyType(
+    {
+        "greeting": (
+            "Good day, sir. Ready to bring order to your digital chaos.",
+            "Alfred at your service. Shall we tidy up those files?",
+            "Ah, I see we have some organizing to do. Leave it to me.",
+        ),
+        "messy_filename": (
+            "I see we're being creative with naming conventions today, sir.",
+            "Ah, 'asdfasdf.pdf' - a classic. I'll fix that for you.",
+            "Your naming skills are... unique. Allow me to assist.",
+        ),
+        "success": (
+            "Filed successfully. You'll find it exactly where it should be.",
+            "Organization complete. Your files are now in their proper place.",
+            "Done. I've taken the liberty of giving it a sensible name as well.",
+        ),
+        "error": (
+            "I'm terribly sorry, but I encountered an issue.",
+            "My apologies, sir. Something went awry.",
+            "How embarrassing. Let me try that again.",
+        ),
+    }
+)
@@ -2,163 +2,219 @@
 config.py - Configuration management for Alfred
 
 Loads configuration from environment variables and provides defaults.
+Settings are resolved lazily: the .env parse, environment lookups, and
+path expansion run once on first attribute access, not at import time.
 """
 
+import functools
+import hashlib
 import os
+import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+_BOOTSTRAPPED = False
+_BOOTSTRAP_LOCK = threading.Lock()
 
+# Directories already created (or confirmed present) by this process
+_CREATED_DIRS = set()
 
-class Config:
-    """Central configuration for Alfred."""
 
-    # Environment
-    ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-    IS_DEVELOPMENT = ENVIRONMENT == "development"
+def _make_directories(paths):
+    """Create directories with one mkdir per unique missing ancestor.
+
+    Deduplicates shared parents across the given paths and sorts so
+    parents precede children, avoiding the O(depth) re-stat that each
+    ``mkdir(parents=True)`` call would otherwise perform. Directories
+    seen in a previous call are skipped entirely.
+
+    Returns a list of error strings for directories that could not be
+    created (permissions, read-only filesystem, ...).
+    """
+    pending = set()
+    for path in paths:
+        path = Path(path)
+        while path.name and path not in _CREATED_DIRS and path not in pending:
+            pending.add(path)
+            path = path.parent
+
+    errors = []
+    for directory in sorted(pending, key=lambda p: len(p.parts)):
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            errors.append(f"Cannot create directory {directory}: {e}")
+            continue
+        _CREATED_DIRS.add(directory)
+    return errors
+
+
+@functools.cache
+def _parse_watch_folders(raw):
+    """Parse a comma-separated folder list into expanded Paths.
+
+    Memoized so repeat bootstraps (tests, Streamlit reruns) skip the
+    split and per-folder expanduser. Returns a tuple: immutable,
+    hashable, and iterates the same as the old list.
+    """
+    return tuple(
+        Path(folder.strip()).expanduser() for folder in raw.split(",") if folder.strip()
+    )
+
+
+@functools.cache
+def _parse_root(raw):
+    """Expand a single configured directory path, memoized."""
+    return Path(raw.strip()).expanduser()
+
+
+def _bootstrap():
+    """Read .env and environment variables once, on first config access.
+
+    Double-checked locking: the unlocked flag read keeps the settled
+    path free, and the locked re-check makes concurrent first accesses
+    (Streamlit runs a thread per session) wait for one bootstrap instead
+    of racing it.
+    """
+    global _BOOTSTRAPPED
+    if _BOOTSTRAPPED:
+        return
+    with _BOOTSTRAP_LOCK:
+        if _BOOTSTRAPPED:
+            return
+        _do_bootstrap()
+        # Set only after every attribute is assigned, so a failure
+        # partway (bad ALFRED_MAX_FILE_SIZE_MB, say) surfaces again on
+        # the next access instead of degrading to AttributeError
+        _BOOTSTRAPPED = True
+
+
+def _do_bootstrap():
+    """Populate Config from .env and the environment. Caller holds the lock."""
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+
+    environment = os.getenv("ENVIRONMENT", "development")
+    is_development = environment == "development"
 
     # Paths - Use dev folders in development, real folders in production
-    if IS_DEVELOPMENT:
-        WATCH_FOLDERS = os.getenv(
+    if is_development:
+        watch_folders = os.getenv(
             "ALFRED_WATCH_FOLDERS",
             "dev_folders/watched/downloads,dev_folders/watched/desktop,dev_folders/watched/documents",
-        ).split(",")
-        ORGANIZE_ROOT = Path(os.getenv("ALFRED_ORGANIZE_ROOT", "dev_folders/organized"))
+        )
+        organize_root = os.getenv("ALFRED_ORGANIZE_ROOT", "dev_folders/organized")
     else:
-        WATCH_FOLDERS = os.getenv(
+        watch_folders = os.getenv(
             "ALFRED_WATCH_FOLDERS", "~/Downloads,~/Desktop,~/Documents"
-        ).split(",")
-        ORGANIZE_ROOT = Path(os.getenv("ALFRED_ORGANIZE_ROOT", "~/Documents"))
+        )
+        organize_root = os.getenv("ALFRED_ORGANIZE_ROOT", "~/Documents")
 
-    # Convert to Path objects and expand user paths
-    WATCH_FOLDERS = [Path(folder).expanduser() for folder in WATCH_FOLDERS]
-    ORGANIZE_ROOT = ORGANIZE_ROOT.expanduser()
+    settings = {
+        "ENVIRONMENT": environment,
+        "IS_DEVELOPMENT": is_development,
+        # Convert to Path objects and expand user paths (memoized)
+        "WATCH_FOLDERS": _parse_watch_folders(watch_folders),
+        "ORGANIZE_ROOT": _parse_root(organize_root),
+        # Google AI
+        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
+        # File handling
+        "MAX_FILE_SIZE_MB": int(os.getenv("ALFRED_MAX_FILE_SIZE_MB", "100")),
+        # Security (optional for now)
+        "ENCRYPTION_KEY": os.getenv("ENCRYPTION_KEY"),
+        # Feature flags
+        "ENABLE_ALFRED_PERSONALITY": (
+            os.getenv("ENABLE_ALFRED_PERSONALITY", "true").lower() == "true"
+        ),
+        "ENABLE_AUTO_ORGANIZE": (
+            os.getenv("ENABLE_AUTO_ORGANIZE", "false").lower() == "true"
+        ),
+        "ENABLE_BATCH_PROCESSING": (
+            os.getenv("ENABLE_BATCH_PROCESSING", "true").lower() == "true"
+        ),
+        "FAKE_PROCESSING_DELAY": float(os.getenv("FAKE_PROCESSING_DELAY", "0.5")),
+        # Logging
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO"),
+        "LOG_FILE": os.getenv("LOG_FILE", "alfred.log"),
+        # UI Settings
+        "STREAMLIT_PORT": int(os.getenv("STREAMLIT_PORT", "8501")),
+        "STREAMLIT_THEME": os.getenv("STREAMLIT_THEME", "dark"),
+    }
 
-    # Google AI
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    GEMINI_MODEL_FAST = "gemini-2.0-flash-exp"  # For quick operations
-    GEMINI_MODEL_SMART = "gemini-2.0-flash-exp"  # Will update to 2.5 when available
+    # Publish only after every value parsed cleanly: a bad variable
+    # (non-integer ALFRED_MAX_FILE_SIZE_MB, say) leaves Config untouched
+    # for the retry instead of half-populated
+    for attr, value in settings.items():
+        setattr(Config, attr, value)
 
-    # File handling
-    MAX_FILE_SIZE_MB = int(os.getenv("ALFRED_MAX_FILE_SIZE_MB", "100"))
-    SUPPORTED_EXTENSIONS = {
-        # Documents
-        ".pdf",
-        ".doc",
-        ".docx",
-        ".txt",
-        ".rtf",
-        ".odt",
-        # Spreadsheets
-        ".xls",
-        ".xlsx",
-        ".csv",
-        ".ods",
-        # Presentations
-        ".ppt",
-        ".pptx",
-        ".odp",
-        # Images
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".bmp",
-        ".svg",
-        ".webp",
-        # Data files
-        ".json",
-        ".xml",
-        ".yaml",
-        ".yml",
-        # Archives
-        ".zip",
-        # Common formats
-        ".md",
-        ".log",
-    }
 
-    # Security (optional for now)
-    ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
+# Parsed once at import; display_config fills it with resolved values
+_CONFIG_TEMPLATE = (
+    "\n🎩 Alfred Configuration\n"
+    + "=" * 50
+    + "\n"
+    + "Environment: {env}\n"
+    "Watch Folders: {watches}\n"
+    "Organize Root: {root}\n"
+    "Gemini API Key: {api_key}\n"
+    "Auto-organize: {auto_organize}\n"
+    "Alfred Personality: {personality}\n" + "=" * 50 + "\n"
+)
 
-    # Feature flags
-    ENABLE_ALFRED_PERSONALITY = (
-        os.getenv("ENABLE_ALFRED_PERSONALITY", "true").lower() == "true"
-    )
-    ENABLE_AUTO_ORGANIZE = os.getenv("ENABLE_AUTO_ORGANIZE", "false").lower() == "true"
-    ENABLE_BATCH_PROCESSING = (
-        os.getenv("ENABLE_BATCH_PROCESSING", "true").lower() == "true"
-    )
-    FAKE_PROCESSING_DELAY = float(os.getenv("FAKE_PROCESSING_DELAY", "0.5"))
-
-    # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE = os.getenv("LOG_FILE", "alfred.log")
-
-    # UI Settings
-    STREAMLIT_PORT = int(os.getenv("STREAMLIT_PORT", "8501"))
-    STREAMLIT_THEME = os.getenv("STREAMLIT_THEME", "dark")
-
-    # Alfred personality settings
-    ALFRED_RESPONSES = {
-        "greeting": [
-            "Good day, sir. Ready to bring order to your digital chaos.",
-            "Alfred at your service. Shall we tidy up those files?",
-            "Ah, I see we have some organizing to do. Leave it to me.",
-        ],
-        "messy_filename": [
-            "I see we're being creative with naming conventions today, sir.",
-            "Ah, 'asdfasdf.pdf' - a classic. I'll fix that for you.",
-            "Your naming skills are... unique. Allow me to assist.",
-        ],
-        "success": [
-            "Filed successfully. You'll find it exactly where it should be.",
-            "Organization complete. Your files are now in their proper place.",
-            "Done. I've taken the liberty of giving it a sensible name as well.",
-        ],
-        "error": [
-            "I'm terribly sorry, but I encountered an issue.",
-            "My apologies, sir. Something went awry.",
-            "How embarrassing. Let me try that again.",
-        ],
-    }
+# Static tables served from _constants on first read, without triggering
+# the environment bootstrap
+_CONSTANT_ATTRS = frozenset({"SUPPORTED_EXTENSIONS", "ALFRED_RESPONSES"})
 
-    @classmethod
-    def validate(cls):
-        """Validate configuration and raise errors if invalid."""
-        errors = []
 
-        # Check API key
-        if not cls.GEMINI_API_KEY:
-            errors.append("GEMINI_API_KEY is not set. Please add it to your .env file.")
+class _LazyConfigMeta(type):
+    """Metaclass that bootstraps the environment on first attribute miss."""
 
-        # Check paths exist in development
-        if cls.IS_DEVELOPMENT:
-            for folder in cls.WATCH_FOLDERS:
-                if not folder.exists():
-                    errors.append(f"Watch folder does not exist: {folder}")
+    def __getattr__(cls, name):
+        if name in _CONSTANT_ATTRS:
+            from . import _constants
 
-            if not cls.ORGANIZE_ROOT.exists():
-                errors.append(f"Organize root does not exist: {cls.ORGANIZE_ROOT}")
+            value = getattr(_constants, name)
+            setattr(cls, name, value)
+            return value
+        # No-op once settled; otherwise runs (or waits out) the bootstrap.
+        # The dict probe comes after so a lookup that raced the bootstrap
+        # still sees the freshly assigned attribute.
+        _bootstrap()
+        if name in cls.__dict__:
+            return cls.__dict__[name]
+        raise AttributeError(
+            f"type object {cls.__name__!r} has no attribute {name!r}"
+        )
 
-        if errors:
-            raise ValueError("Configuration errors:\n" + "\n".join(errors))
 
-    @classmethod
-    def create_directories(cls):
-        """Create necessary directories if they don't exist."""
-        # Create organize root
-        cls.ORGANIZE_ROOT.mkdir(parents=True, exist_ok=True)
+class Config(metaclass=_LazyConfigMeta):
+    """Central configuration for Alfred.
 
-        # Create watch folders in development
-        if cls.IS_DEVELOPMENT:
-            for folder in cls.WATCH_FOLDERS:
-                folder.mkdir(parents=True, exist_ok=True)
+    Environment-derived settings (WATCH_FOLDERS, GEMINI_API_KEY, feature
+    flags, ...) are populated by :func:`_bootstrap` the first time any of
+    them is accessed on the class or the ``config`` singleton.
+    """
+
+    GEMINI_MODEL_FAST = "gemini-2.0-flash-exp"  # For quick operations
+    GEMINI_MODEL_SMART = "gemini-2.0-flash-exp"  # Will update to 2.5 when available
+
+    # SUPPORTED_EXTENSIONS and ALFRED_RESPONSES live in src/_constants.py
+    # as frozen tables and are attached here on first access.
 
-        # Create standard organization structure
+    def __getattr__(self, name):
+        # Instance lookups bypass the metaclass, so delegate to the class.
+        return getattr(type(self), name)
+
+    @classmethod
+    def _managed_directories(cls):
+        """Every directory Alfred expects to exist for this environment."""
+        # Standard organization structure
         categories = [
             "Documents/Invoices/2024",
             "Documents/Invoices/2025",
@@ -170,31 +226,123 @@ class Config:
             "Documents/Archives",
         ]
 
-        for category in categories:
-            (cls.ORGANIZE_ROOT / category).mkdir(parents=True, exist_ok=True)
+        targets = [cls.ORGANIZE_ROOT]
+        targets.extend(cls.ORGANIZE_ROOT / category for category in categories)
+
+        # Watch folders are only managed in development
+        if cls.IS_DEVELOPMENT:
+            targets.extend(cls.WATCH_FOLDERS)
+
+        return targets
+
+    @classmethod
+    def ensure_and_verify(cls):
+        """Create and verify the managed directories in a single pass.
+
+        Replaces the old create-then-stat split between
+        create_directories and validate: one mkdir walk both ensures the
+        tree exists and reports anything that could not be created.
+
+        Returns:
+            List of error strings (empty when everything is in place)
+        """
+        return _make_directories(cls._managed_directories())
+
+    # How long a successful directory check stays cached on this machine
+    _VALIDATE_CACHE_TTL = 3600
+
+    @classmethod
+    def _sentinel_path(cls):
+        """Per-user tempdir sentinel keyed to the managed directory list.
+
+        Hashing the paths into the name invalidates the cache whenever
+        the configuration changes; the uid keeps users on a shared
+        machine from clobbering each other's sentinel. The name is
+        predictable, so _paths_recently_verified additionally checks
+        that the file is really owned by this user before trusting it.
+        """
+        key = hashlib.sha256(
+            "\n".join(str(path) for path in cls._managed_directories()).encode()
+        ).hexdigest()[:16]
+        uid = os.getuid() if hasattr(os, "getuid") else 0
+        return Path(tempfile.gettempdir()) / f"alfred_config_ok_{uid}_{key}"
+
+    @classmethod
+    def _paths_recently_verified(cls):
+        """True if this user passed the directory check within the TTL."""
+        try:
+            st = cls._sentinel_path().stat()
+        except OSError:
+            return False
+        # Ignore a sentinel planted by another local user: the tempdir is
+        # shared and the filename is predictable
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            return False
+        return st.st_mtime > time.time() - cls._VALIDATE_CACHE_TTL
+
+    @classmethod
+    def validate(cls):
+        """Validate configuration and raise errors if invalid.
+
+        The directory pass can be skipped entirely with
+        ``ALFRED_SKIP_VALIDATE=1`` (production deployments where the
+        paths are managed externally), and a successful pass is cached
+        in a tempdir sentinel for an hour so repeated process spawns on
+        the same machine don't re-stat the tree.
+        """
+        errors = []
+
+        # Check API key
+        if not cls.GEMINI_API_KEY:
+            errors.append("GEMINI_API_KEY is not set. Please add it to your .env file.")
+
+        skip_paths = (
+            os.getenv("ALFRED_SKIP_VALIDATE") == "1" or cls._paths_recently_verified()
+        )
+        if not skip_paths:
+            errors.extend(cls.ensure_and_verify())
+            if not errors:
+                try:
+                    cls._sentinel_path().touch()
+                except OSError:
+                    pass  # cache is an optimization; never fail validate over it
+
+        if errors:
+            raise ValueError("Configuration errors:\n" + "\n".join(errors))
+
+    @classmethod
+    def create_directories(cls):
+        """Create necessary directories if they don't exist."""
+        cls.ensure_and_verify()
 
     @classmethod
     def display_config(cls):
         """Display current configuration (hiding sensitive values)."""
-        print("\n🎩 Alfred Configuration")
-        print("=" * 50)
-        print(f"Environment: {cls.ENVIRONMENT}")
-        print(f"Watch Folders: {[str(f) for f in cls.WATCH_FOLDERS]}")
-        print(f"Organize Root: {cls.ORGANIZE_ROOT}")
-        print(f"Gemini API Key: {'✓ Set' if cls.GEMINI_API_KEY else '✗ Not Set'}")
-        print(
-            f"Auto-organize: {'✓ Enabled' if cls.ENABLE_AUTO_ORGANIZE else '✗ Disabled'}"
-        )
-        print(
-            f"Alfred Personality: {'✓ Enabled' if cls.ENABLE_ALFRED_PERSONALITY else '✗ Disabled'}"
-        )
-        print("=" * 50)
+        values = {
+            "env": cls.ENVIRONMENT,
+            "watches": [str(f) for f in cls.WATCH_FOLDERS],
+            "root": cls.ORGANIZE_ROOT,
+            "api_key": "✓ Set" if cls.GEMINI_API_KEY else "✗ Not Set",
+            "auto_organize": (
+                "✓ Enabled" if cls.ENABLE_AUTO_ORGANIZE else "✗ Disabled"
+            ),
+            "personality": (
+                "✓ Enabled" if cls.ENABLE_ALFRED_PERSONALITY else "✗ Disabled"
+            ),
+        }
+        sys.stdout.write(_CONFIG_TEMPLATE.format_map(values))
 
 
 # Create a singleton instance
 config = Config()
 
-# Convenience exports
-WATCH_FOLDERS = config.WATCH_FOLDERS
-ORGANIZE_ROOT = config.ORGANIZE_ROOT
-GEMINI_API_KEY = config.GEMINI_API_KEY
+# Convenience exports, resolved lazily so importing this module stays cheap
+_LAZY_EXPORTS = frozenset({"WATCH_FOLDERS", "ORGANIZE_ROOT", "GEMINI_API_KEY"})
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(Config, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,16 +6,18 @@ For now, it's a placeholder that shows Alfred is working.
 """
 
 import sys
-from pathlib import Path
-from .config import config
-from .utils import clean_filename
 
 
 def main():
     """Main entry point for Alfred CLI."""
+    # Print the banner before the heavy imports so the user sees
+    # feedback immediately.
     print("🎩 Alfred AI File Butler")
     print("=" * 40)
 
+    from .config import config
+    from .utils import clean_filename
+
     # Display configuration
     config.display_config()
 
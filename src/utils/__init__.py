@@ -2,101 +2,77 @@
 Alfred Utils Module
 
 Utility functions for file operations, validation, and formatting.
-"""
-
-# Import main functions for easier access
-from .helpers import (
-    FileOperationError,
-    ensure_directory,
-    safe_move_file,
-    get_unique_filepath,
-    get_file_metadata,
-    calculate_file_hash,
-    format_file_size,
-    build_organized_path,
-    copy_file_safe,
-    get_file_type_category,
-    read_json_file,
-    write_json_file,
-    list_files_in_directory,
-    is_hidden_file,
-    create_test_file,
-)
 
-from .validators import (
-    ValidationError,
-    validate_file_path,
-    validate_file_size,
-    validate_filename,
-    validate_file_extension,
-    is_supported_file_type,
-    validate_directory_path,
-    validate_mime_type,
-    sanitize_filename,
-    validate_category_name,
-    validate_file_operation,
-    validate_batch_operation,
-)
+Submodules are loaded lazily: each re-exported name is resolved on first
+attribute access, so importing this package costs almost nothing until a
+function is actually used.
+"""
 
-from .formatters import (
-    clean_filename,
-    format_date_for_filename,
-    create_descriptive_filename,
-    format_document_type,
-    clean_company_name,
-    format_person_name,
-    format_folder_path,
-    humanize_file_size,
-    format_time_ago,
-    generate_unique_suffix,
-    format_month_name,
-    truncate_text,
-    create_screenshot_filename,
-)
+import importlib
 
-__all__ = [
-    # Exceptions
-    "FileOperationError",
-    "ValidationError",
+# Map each public name to the submodule that defines it.
+_ATTR_MAP = {
     # Helper functions
-    "ensure_directory",
-    "safe_move_file",
-    "get_unique_filepath",
-    "get_file_metadata",
-    "calculate_file_hash",
-    "format_file_size",
-    "build_organized_path",
-    "copy_file_safe",
-    "get_file_type_category",
-    "read_json_file",
-    "write_json_file",
-    "list_files_in_directory",
-    "is_hidden_file",
-    "create_test_file",
+    "FileOperationError": "helpers",
+    "ensure_directory": "helpers",
+    "safe_move_file": "helpers",
+    "get_unique_filepath": "helpers",
+    "get_file_metadata": "helpers",
+    "calculate_file_hash": "helpers",
+    "hash_files_bulk": "helpers",
+    "format_file_size": "helpers",
+    "build_organized_path": "helpers",
+    "copy_file_safe": "helpers",
+    "get_file_type_category": "helpers",
+    "read_json_file": "helpers",
+    "write_json_file": "helpers",
+    "list_files_in_directory": "helpers",
+    "is_hidden_file": "helpers",
+    "create_test_file": "helpers",
     # Validator functions
-    "validate_file_path",
-    "validate_file_size",
-    "validate_filename",
-    "validate_file_extension",
-    "is_supported_file_type",
-    "validate_directory_path",
-    "validate_mime_type",
-    "sanitize_filename",
-    "validate_category_name",
-    "validate_file_operation",
-    "validate_batch_operation",
+    "ValidationError": "validators",
+    "validate_file_path": "validators",
+    "validate_file_size": "validators",
+    "validate_filename": "validators",
+    "validate_file_extension": "validators",
+    "is_supported_file_type": "validators",
+    "validate_directory_path": "validators",
+    "validate_mime_type": "validators",
+    "sanitize_filename": "validators",
+    "validate_category_name": "validators",
+    "validate_file_operation": "validators",
+    "validate_batch_operation": "validators",
+    "validate_files": "validators",
     # Formatter functions
-    "clean_filename",
-    "format_date_for_filename",
-    "create_descriptive_filename",
-    "format_document_type",
-    "clean_company_name",
-    "format_person_name",
-    "format_folder_path",
-    "humanize_file_size",
-    "format_time_ago",
-    "generate_unique_suffix",
-    "format_month_name",
-    "truncate_text",
-    "create_screenshot_filename",
-]
+    "clean_filename": "formatters",
+    "format_date_for_filename": "formatters",
+    "create_descriptive_filename": "formatters",
+    "format_document_type": "formatters",
+    "clean_company_name": "formatters",
+    "format_person_name": "formatters",
+    "format_folder_path": "formatters",
+    "humanize_file_size": "formatters",
+    "format_time_ago": "formatters",
+    "generate_unique_suffix": "formatters",
+    "format_month_name": "formatters",
+    "truncate_text": "formatters",
+    "create_screenshot_filename": "formatters",
+}
+
+__all__ = list(_ATTR_MAP)
+
+
+def __getattr__(name):
+    """Resolve re-exported names on first access and cache them."""
+    try:
+        submodule = _ATTR_MAP[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{submodule}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,6 +4,7 @@ formatters.py - Output formatting functions for Alfred
 Functions to clean filenames, format dates, and create human-friendly naming.
 """
 
+import bisect
 import re
 import unicodedata
 from datetime import datetime, date
@@ -11,6 +12,158 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 import calendar
 
+# Compiled once at import - these run on every rename, and per-call
+# re.sub with a string literal pays pattern parsing/cache hashing each time.
+_RE_MULTI_SPACE = re.compile(r"\s+")
+_RE_FINAL_FINAL = re.compile(r"final_final")
+_RE_FINAL_VERSION = re.compile(r"final_v\d+")
+_RE_NON_WORD = re.compile(r"[^\w]")
+
+
+def _build_ascii_fold():
+    """Precompute the ASCII projection of NFKD for common Latin codepoints.
+
+    Covers Latin-1 Supplement through Latin Extended-B, so the typical
+    accented filename folds via one str.translate instead of a full
+    NFKD walk plus two codec round-trips.
+    """
+    table = {}
+    for codepoint in range(0x80, 0x250):
+        folded = (
+            unicodedata.normalize("NFKD", chr(codepoint))
+            .encode("ascii", "ignore")
+            .decode("ascii")
+        )
+        table[codepoint] = folded
+    return table
+
+
+_ASCII_FOLD = str.maketrans(_build_ascii_fold())
+
+# Single-pass scanner for clean_filename: one alternation walks the
+# string once instead of six independent re.sub passes, each of which
+# re-scanned and re-allocated the whole buffer. Alternative order
+# matters - the copy-marker branches must win over the separator runs.
+#
+# Removed copy markers leave a NUL sentinel so a short second pass can
+# re-collapse the separator runs the removal made adjacent (the old
+# sequential pipeline collapsed runs after marker removal); separators
+# elsewhere keep their single-scan treatment. A literal NUL in the
+# input falls into the "bad" branch and is dropped before the
+# sentinels are inserted, so it can never fake a marker site.
+_RE_CLEAN_SCAN = re.compile(
+    r"(?P<paren>\s*\(\d+\)\s*)"  # (1), (2), ...
+    r"|(?P<dashcopy>\s*-\s*copy\s*)"  # "- Copy"
+    r"|(?P<copyof>\s*copy\s*of\s*)"  # "Copy of"
+    r"|(?P<us>_+)"  # underscore runs
+    # A hyphen run stops one short of a "-copy" marker so the marker
+    # branch still gets its hyphen, as the sequential passes did
+    r"|(?P<hy>-+(?!\s*copy))"  # hyphen runs
+    r"|(?P<sp>\s+)"  # whitespace runs
+    r"|(?P<bad>[^a-z0-9_\- ])"  # everything else unsafe
+)
+_CLEAN_REPLACEMENTS = {
+    "paren": "\x00",
+    "dashcopy": "\x00",
+    "copyof": "\x00",
+    "us": "_",
+    "hy": "-",
+    "sp": " ",
+    "bad": "",
+}
+
+# A marker site with the separators on either side of it
+_RE_MARKER_CLUSTER = re.compile(r"[_\- ]*\x00[_\- ]*(?:\x00[_\- ]*)*")
+_RE_SEP_RUN = re.compile(r"([_\- ])\1+")
+
+
+def _clean_scan_repl(match):
+    return _CLEAN_REPLACEMENTS[match.lastgroup]
+
+
+def _marker_cluster_repl(match):
+    # Drop the sentinels and collapse the separator runs their removal
+    # joined, exactly as the old collapse passes did after marker
+    # removal
+    separators = match.group(0).replace("\x00", "")
+    return _RE_SEP_RUN.sub(r"\1", separators) if separators else ""
+
+
+def _clean_scan(name):
+    name = _RE_CLEAN_SCAN.sub(_clean_scan_repl, name)
+    if "\x00" in name:
+        name = _RE_MARKER_CLUSTER.sub(_marker_cluster_repl, name)
+    return name
+
+# Legal-entity suffixes, longest first so the alternation prefers
+# "Corporation" over "Corp" and "Limited" over "Ltd"
+_COMPANY_SUFFIXES = (
+    "Corporation",
+    "Holdings",
+    "Limited",
+    "Company",
+    "Group",
+    "Corp",
+    "GmbH",
+    "Inc",
+    "LLC",
+    "Ltd",
+    "PLC",
+    "LLP",
+    "AG",
+    "SA",
+    "Co",
+    "LP",
+)
+# One anchored pass strips any stack of trailing suffixes ("Co. Inc.")
+_RE_COMPANY_SUFFIXES = re.compile(
+    rf"(?:\s*\b(?:{'|'.join(_COMPANY_SUFFIXES)})\b\.?\s*)+$", re.I
+)
+_RE_THE_PREFIX = re.compile(r"^\s*the\s+", re.I)
+_RE_COMPANY_SPECIAL = re.compile(r"[^\w\s-]")
+_RE_RESOLUTION = re.compile(r"(\d+x\d+)")
+
+# Deletion tables: one C-level translate pass replaces the regex engine
+# for the common all-ASCII name. Non-ASCII input keeps the regex path
+# since \w there also covers accented letters.
+_DELETE_NON_WORD = str.maketrans(
+    "", "", "".join(c for c in map(chr, range(128)) if not (c.isalnum() or c == "_"))
+)
+_DELETE_NON_FILENAME = str.maketrans(
+    "", "", "".join(c for c in map(chr, range(128)) if not (c.isalnum() or c in "_-"))
+)
+
+# Size unit per 10-bit magnitude step, indexed by bit_length
+_SIZE_UNITS = ("bytes", "KB", "MB", "GB", "TB", "PB")
+
+# Age buckets for format_time_ago: thresholds picked by bisect, with a
+# parallel formatter per bucket (the last one falls back to a date)
+_TIME_THRESHOLDS = (60, 3600, 86400, 172800, 604800, 2592000)
+_TIME_FORMATTERS = (
+    lambda seconds, ts: "just now",
+    lambda seconds, ts: (
+        f"{int(seconds / 60)} minute{'s' if int(seconds / 60) != 1 else ''} ago"
+    ),
+    lambda seconds, ts: (
+        f"{int(seconds / 3600)} hour{'s' if int(seconds / 3600) != 1 else ''} ago"
+    ),
+    lambda seconds, ts: "yesterday",
+    lambda seconds, ts: f"{int(seconds / 86400)} days ago",
+    lambda seconds, ts: (
+        f"{int(seconds / 604800)} week{'s' if int(seconds / 604800) != 1 else ''} ago"
+    ),
+    lambda seconds, ts: ts.strftime("%B %d, %Y"),
+)
+
+# strftime formats by style, built once instead of per call
+_DATE_FORMATS = {
+    "compact": "%Y%m%d",
+    "readable": "%Y-%m-%d",
+    "full": "%Y-%m-%d_%H%M%S",
+    "american": "%m-%d-%Y",
+    "european": "%d-%m-%Y",
+}
+
 
 def clean_filename(
     filename: str, keep_spaces: bool = True, max_length: Optional[int] = 100
@@ -38,24 +191,26 @@ def clean_filename(
         name = filename
         extension = ""
 
-    # Remove Unicode characters and normalize
-    name = unicodedata.normalize("NFKD", name)
-    name = name.encode("ascii", "ignore").decode("ascii")
+    # Remove Unicode characters and normalize. Most filenames are pure
+    # ASCII - skip the NFKD walk entirely for those, fold common Latin
+    # accents through the precomputed table, and only fall back to full
+    # NFKD for anything more exotic.
+    if not name.isascii():
+        name = name.translate(_ASCII_FOLD)
+        if not name.isascii():
+            name = unicodedata.normalize("NFKD", name)
+            name = name.encode("ascii", "ignore").decode("ascii")
 
     # Convert to lowercase
     name = name.lower()
 
-    # Replace common patterns
-    name = re.sub(r"\s*\(\d+\)\s*", "", name)  # Remove (1), (2), etc.
-    name = re.sub(r"\s*-\s*copy\s*", "", name)  # Remove "- Copy"
-    name = re.sub(r"\s*copy\s*of\s*", "", name)  # Remove "Copy of"
-    name = re.sub(r"_+", "_", name)  # Multiple underscores to single
-    name = re.sub(r"-+", "-", name)  # Multiple hyphens to single
-    name = re.sub(r"\s+", " ", name)  # Multiple spaces to single
+    # Strip copy markers, collapse repeat runs, and drop unsafe
+    # characters in one scan over the string
+    name = _clean_scan(name)
 
     # Handle version indicators
-    name = re.sub(r"final_final", "final", name)
-    name = re.sub(r"final_v\d+", lambda m: m.group(0).replace("final_", ""), name)
+    name = _RE_FINAL_FINAL.sub("final", name)
+    name = _RE_FINAL_VERSION.sub(lambda m: m.group(0).replace("final_", ""), name)
 
     # Replace spaces
     if keep_spaces:
@@ -63,9 +218,6 @@ def clean_filename(
     else:
         name = name.replace(" ", "")
 
-    # Remove special characters except underscore and hyphen
-    name = re.sub(r"[^a-z0-9_\-]", "", name)
-
     # Clean up edges
     name = name.strip("_- ")
 
@@ -99,15 +251,31 @@ def format_date_for_filename(
     if date_obj is None:
         date_obj = datetime.now()
 
-    formats = {
-        "compact": "%Y%m%d",
-        "readable": "%Y-%m-%d",
-        "full": "%Y-%m-%d_%H%M%S",
-        "american": "%m-%d-%Y",
-        "european": "%d-%m-%Y",
-    }
+    # Direct formatting skips the strftime parser for the hottest style
+    if format_style == "compact":
+        return f"{date_obj.year:04d}{date_obj.month:02d}{date_obj.day:02d}"
+
+    return date_obj.strftime(_DATE_FORMATS.get(format_style, "%Y-%m-%d"))
 
-    return date_obj.strftime(formats.get(format_style, formats["readable"]))
+
+def _finalize_filename(name: str, extension: str, max_length: int = 100) -> str:
+    """Final steps of clean_filename for names built from clean parts.
+
+    Skips the NFKD normalization and character stripping that
+    clean_filename performs on ASCII input, since callers guarantee the
+    characters are already safe.
+    """
+    if not name.isascii():
+        name = name.translate(_ASCII_FOLD)
+        if not name.isascii():
+            name = unicodedata.normalize("NFKD", name)
+            name = name.encode("ascii", "ignore").decode("ascii")
+    name = name.lower().replace(" ", "_").strip("_- ")
+    if not name:
+        name = "unnamed"
+    if max_length and len(name) > max_length:
+        name = name[:max_length].rstrip("_-")
+    return name + extension
 
 
 def create_descriptive_filename(
@@ -147,7 +315,14 @@ def create_descriptive_filename(
     if entities.get("invoice_number"):
         parts.append(f"IN{entities['invoice_number']}")
     elif entities.get("reference"):
-        parts.append(entities["reference"][:10])  # Truncate long references
+        # References are the one raw input here; scrub them at append
+        # time so the final assembly can skip the full cleaning pass
+        reference = entities["reference"][:10]  # Truncate long references
+        if not reference.isascii():
+            reference = reference.translate(_ASCII_FOLD)
+            reference = unicodedata.normalize("NFKD", reference)
+            reference = reference.encode("ascii", "ignore").decode("ascii")
+        parts.append(_clean_scan(reference.lower()))
 
     # Add date
     if include_date:
@@ -162,13 +337,40 @@ def create_descriptive_filename(
     if original_name and "." in original_name:
         extension = "." + original_name.rsplit(".", 1)[1].lower()
 
-    # Join parts with underscore
-    filename = "_".join(filter(None, parts))
-
-    # Clean up and add extension
-    filename = clean_filename(filename + extension)
-
-    return filename
+    # Join parts with underscore. Every part is already sanitized by
+    # its formatter, so only the cheap tail of clean_filename remains:
+    # casing, space handling, edge trim, and truncation.
+    return _finalize_filename("_".join(filter(None, parts)), extension)
+
+
+# Canonical names per document type, with a length-sorted view for the
+# partial-match scan so longer (more specific) keys win deterministically
+_TYPE_MAPPING = {
+    "invoice": "Invoice",
+    "receipt": "Receipt",
+    "contract": "Contract",
+    "agreement": "Agreement",
+    "proposal": "Proposal",
+    "report": "Report",
+    "statement": "Statement",
+    "tax": "TaxDoc",
+    "resume": "Resume",
+    "cv": "CV",
+    "letter": "Letter",
+    "memo": "Memo",
+    "presentation": "Presentation",
+    "spreadsheet": "Spreadsheet",
+    "form": "Form",
+    "application": "Application",
+    "certificate": "Certificate",
+    "license": "License",
+    "policy": "Policy",
+    "manual": "Manual",
+    "guide": "Guide",
+}
+_TYPE_PARTIAL_MATCHES = tuple(
+    sorted(_TYPE_MAPPING.items(), key=lambda item: len(item[0]), reverse=True)
+)
 
 
 def format_document_type(doc_type: str) -> str:
@@ -181,37 +383,13 @@ def format_document_type(doc_type: str) -> str:
     Returns:
         Formatted document type
     """
-    type_mapping = {
-        "invoice": "Invoice",
-        "receipt": "Receipt",
-        "contract": "Contract",
-        "agreement": "Agreement",
-        "proposal": "Proposal",
-        "report": "Report",
-        "statement": "Statement",
-        "tax": "TaxDoc",
-        "resume": "Resume",
-        "cv": "CV",
-        "letter": "Letter",
-        "memo": "Memo",
-        "presentation": "Presentation",
-        "spreadsheet": "Spreadsheet",
-        "form": "Form",
-        "application": "Application",
-        "certificate": "Certificate",
-        "license": "License",
-        "policy": "Policy",
-        "manual": "Manual",
-        "guide": "Guide",
-    }
-
     # Try exact match first
     doc_type_lower = doc_type.lower()
-    if doc_type_lower in type_mapping:
-        return type_mapping[doc_type_lower]
+    if doc_type_lower in _TYPE_MAPPING:
+        return _TYPE_MAPPING[doc_type_lower]
 
-    # Try partial match
-    for key, value in type_mapping.items():
+    # Try partial match, longest key first so the most specific wins
+    for key, value in _TYPE_PARTIAL_MATCHES:
         if key in doc_type_lower:
             return value
 
@@ -233,40 +411,19 @@ def clean_company_name(company: str) -> str:
     Returns:
         Cleaned company name
     """
-    # Remove common suffixes
-    suffixes = [
-        "Inc.",
-        "Inc",
-        "LLC",
-        "Ltd.",
-        "Ltd",
-        "Corporation",
-        "Corp.",
-        "Corp",
-        "Company",
-        "Co.",
-        "Co",
-        "Group",
-        "Holdings",
-        "Limited",
-        "GmbH",
-        "AG",
-        "SA",
-        "PLC",
-        "LLP",
-        "LP",
-    ]
-
-    name = company
-    for suffix in suffixes:
-        name = re.sub(rf"\s*\b{re.escape(suffix)}\b\.?\s*$", "", name, flags=re.I)
+    # Remove common suffixes in a single anchored pass
+    name = _RE_COMPANY_SUFFIXES.sub("", company)
 
     # Remove "The" from beginning
-    name = re.sub(r"^\s*the\s+", "", name, flags=re.I)
+    name = _RE_THE_PREFIX.sub("", name)
 
-    # Remove special characters and spaces
-    name = re.sub(r"[^\w\s-]", "", name)
-    name = re.sub(r"\s+", "", name)  # Remove all spaces for filename
+    # Remove special characters and spaces - the two regex passes
+    # (strip specials, then strip spaces) collapse into one translate
+    if name.isascii():
+        name = name.translate(_DELETE_NON_FILENAME)
+    else:
+        name = _RE_COMPANY_SPECIAL.sub("", name)
+        name = _RE_MULTI_SPACE.sub("", name)
 
     # Limit length
     return name[:30]
@@ -301,7 +458,10 @@ def format_person_name(person: str) -> str:
         formatted = "".join(parts)
 
     # Remove special characters
-    formatted = re.sub(r"[^\w]", "", formatted)
+    if formatted.isascii():
+        formatted = formatted.translate(_DELETE_NON_WORD)
+    else:
+        formatted = _RE_NON_WORD.sub("", formatted)
 
     # Capitalize properly
     return formatted.capitalize()
@@ -329,19 +489,17 @@ def format_folder_path(
     Returns:
         Formatted folder path
     """
-    parts = [category]
-
-    if subcategory:
-        parts.append(subcategory)
-
-    if year:
-        parts.append(str(year))
-
     if month:
-        # Ensure month is properly capitalized
-        parts.append(month.capitalize())
+        # Ensure month is properly capitalized (skip the re-allocation
+        # when it already is, the common case)
+        if not (month[:1].isupper() and month[1:].islower()):
+            month = month.capitalize()
 
-    return "/".join(parts)
+    # Build the parts as one tuple; filter(None, ...) drops the unset
+    # (and empty) segments without any list appends
+    return "/".join(
+        filter(None, (category, subcategory, str(year) if year else None, month))
+    )
 
 
 def humanize_file_size(size_bytes: int) -> str:
@@ -357,15 +515,10 @@ def humanize_file_size(size_bytes: int) -> str:
     if size_bytes < 1024:
         return f"{size_bytes} bytes"
 
-    units = ["KB", "MB", "GB", "TB"]
-    size = float(size_bytes) / 1024
-
-    for unit in units:
-        if size < 1024:
-            return f"{size:.1f} {unit}"
-        size /= 1024
-
-    return f"{size:.1f} PB"
+    # The unit index is just the magnitude in 1024-steps - computed
+    # directly from bit_length instead of a division loop
+    index = min((size_bytes.bit_length() - 1) // 10, 5)
+    return f"{size_bytes / (1 << (index * 10)):.1f} {_SIZE_UNITS[index]}"
 
 
 def format_time_ago(timestamp: datetime) -> str:
@@ -384,29 +537,11 @@ def format_time_ago(timestamp: datetime) -> str:
     Returns:
         Human-readable time string
     """
-    now = datetime.now()
-    diff = now - timestamp
-
-    seconds = diff.total_seconds()
-
-    if seconds < 60:
-        return "just now"
-    elif seconds < 3600:
-        minutes = int(seconds / 60)
-        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-    elif seconds < 86400:
-        hours = int(seconds / 3600)
-        return f"{hours} hour{'s' if hours != 1 else ''} ago"
-    elif seconds < 172800:
-        return "yesterday"
-    elif seconds < 604800:
-        days = int(seconds / 86400)
-        return f"{days} days ago"
-    elif seconds < 2592000:
-        weeks = int(seconds / 604800)
-        return f"{weeks} week{'s' if weeks != 1 else ''} ago"
-    else:
-        return timestamp.strftime("%B %d, %Y")
+    seconds = (datetime.now() - timestamp).total_seconds()
+
+    # bisect_right reproduces the old strict < comparisons exactly
+    index = bisect.bisect_right(_TIME_THRESHOLDS, seconds)
+    return _TIME_FORMATTERS[index](seconds, timestamp)
 
 
 def generate_unique_suffix(base_name: str, existing_names: List[str]) -> str:
@@ -461,7 +596,13 @@ def truncate_text(text: str, max_length: int = 50, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
 
-    return text[: max_length - len(suffix)].rstrip() + suffix
+    # Cut at the last space before the limit so words are not split;
+    # rfind scans at most max_length characters and we slice once.
+    cut = max_length - len(suffix)
+    end = text.rfind(" ", 0, cut + 1)
+    if end <= 0:
+        end = cut
+    return text[:end].rstrip() + suffix
 
 
 def create_screenshot_filename(original: str = None) -> str:
@@ -481,10 +622,10 @@ def create_screenshot_filename(original: str = None) -> str:
     if original and "at" in original.lower():
         # macOS style: "Screenshot 2024-03-15 at 2.34.56 PM"
         display_info = "_macos"
-    elif original and re.search(r"\d+x\d+", original):
-        # Has resolution info
-        match = re.search(r"(\d+x\d+)", original)
+    else:
+        match = _RE_RESOLUTION.search(original) if original else None
         if match:
+            # Has resolution info
             display_info = f"_{match.group(1)}"
 
     formatted_date = timestamp.strftime("%Y%m%d_%H%M%S")
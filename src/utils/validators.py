@@ -6,10 +6,19 @@ Validation utilities to ensure file safety, size limits, and proper inputs.
 
 import os
 import re
+import stat
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set, Union
 import mimetypes
 
+try:
+    from .._constants import SUPPORTED_EXTENSIONS
+except ImportError:
+    # scripts/ put src/ itself on sys.path, making utils a top-level
+    # package with no parent to import through
+    from _constants import SUPPORTED_EXTENSIONS
+
 
 class ValidationError(Exception):
     """Custom exception for validation failures"""
@@ -20,17 +29,46 @@ class ValidationError(Exception):
 # Configuration constants (can be moved to config later)
 MAX_FILE_SIZE_MB = 100  # Maximum file size in MB
 MAX_FILENAME_LENGTH = 255  # Maximum filename length
-DANGEROUS_EXTENSIONS = {".exe", ".bat", ".cmd", ".com", ".scr", ".vbs", ".js", ".jar"}
+MAX_BATCH_TOTAL_MB = 500  # Maximum cumulative batch size in MB
+_MAX_BATCH_TOTAL_BYTES = MAX_BATCH_TOTAL_MB * 1024 * 1024
+DANGEROUS_EXTENSIONS = frozenset(
+    {".exe", ".bat", ".cmd", ".com", ".scr", ".vbs", ".js", ".jar"}
+)
 ALLOWED_CHARACTERS_PATTERN = re.compile(r"^[\w\s\-._()]+$")
 
-
-def validate_file_path(filepath: Path, must_exist: bool = True) -> bool:
+# Characters never allowed in filenames: path separators and control
+# characters are rejected outright; sanitize_filename also rewrites the
+# Windows-special punctuation. Both are scanned in a single C-level pass.
+_DANGEROUS_RE = re.compile(r"[/\\\x00\n\r\t]")
+_INVALID_FILENAME_CHARS = '/\\\0\n\r\t:*?"<>|'
+_SANITIZE_TABLE = str.maketrans({char: "_" for char in _INVALID_FILENAME_CHARS})
+_SANITIZE_RE = re.compile(r'[/\\\x00\n\r\t:*?"<>|]')
+
+# Reserved Windows device names, shared by validate_filename and
+# sanitize_filename instead of rebuilding the set on every call. Every
+# reserved name starts with one of five letters, so a first-character
+# probe skips the stem extraction for almost all real filenames.
+_RESERVED_NAMES = frozenset(
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
+_RESERVED_FIRST = frozenset("CPANLcpanl")
+
+# Only allow alphanumeric, spaces, underscores, and hyphens
+_CATEGORY_PATTERN = re.compile(r"^[\w\s\-]+$")
+
+
+def validate_file_path(
+    filepath: Path, must_exist: bool = True, base: Optional[Path] = None
+) -> bool:
     """
     Validate that a file path is safe and accessible.
 
     Args:
         filepath: Path to validate
         must_exist: If True, checks that file exists
+        base: If given, the resolved path must stay inside this directory
 
     Returns:
         True if valid
@@ -38,35 +76,50 @@ def validate_file_path(filepath: Path, must_exist: bool = True) -> bool:
     Raises:
         ValidationError: If validation fails
     """
-    filepath = Path(filepath)
+    if not isinstance(filepath, Path):
+        filepath = Path(filepath)
+
+    # Reject explicit traversal components. Testing parts is O(depth)
+    # with no full-string materialization, and unlike the old substring
+    # scan it doesn't reject legitimate names like "my..backup.txt".
+    if ".." in filepath.parts:
+        raise ValidationError("Path traversal detected")
 
-    # Check for path traversal attempts
+    # resolve() normalizes symlinks; with a base, escape detection is a
+    # containment test on the result
     try:
-        # Resolve to absolute path and check it doesn't escape
         resolved = filepath.resolve()
-        if ".." in str(filepath):
-            raise ValidationError("Path traversal detected")
-    except Exception as e:
+    except OSError as e:
         raise ValidationError(f"Invalid path: {e}")
+    if base is not None and not resolved.is_relative_to(Path(base).resolve()):
+        raise ValidationError("Path traversal detected")
 
-    # Check existence if required
-    if must_exist and not filepath.exists():
-        raise ValidationError(f"File does not exist: {filepath}")
-
-    # Check if it's actually a file (not directory)
-    if must_exist and not filepath.is_file():
-        raise ValidationError(f"Path is not a file: {filepath}")
+    # Check existence and file type with one stat syscall instead of
+    # the separate exists() and is_file() probes
+    if must_exist:
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            raise ValidationError(f"File does not exist: {filepath}")
+        if not stat.S_ISREG(st.st_mode):
+            raise ValidationError(f"Path is not a file: {filepath}")
 
     return True
 
 
-def validate_file_size(filepath: Path, max_size_mb: Optional[float] = None) -> bool:
+def validate_file_size(
+    filepath: Path,
+    max_size_mb: Optional[float] = None,
+    st: Optional[os.stat_result] = None,
+) -> bool:
     """
     Validate that file size is within acceptable limits.
 
     Args:
         filepath: Path to file
         max_size_mb: Maximum size in megabytes (uses default if None)
+        st: Cached stat result for the file (e.g. from validate_files),
+            so batch callers skip a second stat syscall
 
     Returns:
         True if valid
@@ -77,14 +130,20 @@ def validate_file_size(filepath: Path, max_size_mb: Optional[float] = None) -> b
     if max_size_mb is None:
         max_size_mb = MAX_FILE_SIZE_MB
 
-    filepath = Path(filepath)
-    if not filepath.exists():
-        raise ValidationError(f"File does not exist: {filepath}")
-
-    size_mb = filepath.stat().st_size / (1024 * 1024)
+    # One stat serves both the existence check and the size read; the
+    # limit compares raw bytes so the float division only happens on the
+    # failure branch that formats the message
+    if st is None:
+        try:
+            st = os.stat(os.fspath(filepath))
+        except OSError:
+            raise ValidationError(f"File does not exist: {filepath}")
+    size_bytes = st.st_size
 
-    if size_mb > max_size_mb:
-        raise ValidationError(f"File too large: {size_mb:.1f}MB (max: {max_size_mb}MB)")
+    if size_bytes > max_size_mb * 1048576:
+        raise ValidationError(
+            f"File too large: {size_bytes / 1048576:.1f}MB (max: {max_size_mb}MB)"
+        )
 
     return True
 
@@ -103,58 +162,42 @@ def validate_filename(filename: str, strict: bool = False) -> bool:
     Raises:
         ValidationError: If filename is invalid
     """
-    # Check length
-    if len(filename) > MAX_FILENAME_LENGTH:
+    # Fast acceptance path: one length read, one compiled scan, one
+    # first-letter probe. A typical filename takes exactly this route.
+    length = len(filename)
+    if length > MAX_FILENAME_LENGTH:
         raise ValidationError(
-            f"Filename too long: {len(filename)} chars (max: {MAX_FILENAME_LENGTH})"
+            f"Filename too long: {length} chars (max: {MAX_FILENAME_LENGTH})"
         )
 
-    # Check for empty
-    if not filename or filename.isspace():
+    if length == 0 or filename.isspace():
         raise ValidationError("Filename cannot be empty")
 
-    # Check for dangerous characters
-    dangerous_chars = ["/", "\\", "\0", "\n", "\r", "\t"]
-    if any(char in filename for char in dangerous_chars):
+    if _DANGEROUS_RE.search(filename):
         raise ValidationError("Filename contains invalid characters")
 
     # Strict mode - only allow safe characters
     if strict and not ALLOWED_CHARACTERS_PATTERN.match(filename):
         raise ValidationError("Filename contains special characters (strict mode)")
 
-    # Check for reserved Windows filenames
-    reserved_names = {
-        "CON",
-        "PRN",
-        "AUX",
-        "NUL",
-        "COM1",
-        "COM2",
-        "COM3",
-        "COM4",
-        "COM5",
-        "COM6",
-        "COM7",
-        "COM8",
-        "COM9",
-        "LPT1",
-        "LPT2",
-        "LPT3",
-        "LPT4",
-        "LPT5",
-        "LPT6",
-        "LPT7",
-        "LPT8",
-        "LPT9",
-    }
-
-    name_without_ext = filename.split(".")[0].upper()
-    if name_without_ext in reserved_names:
-        raise ValidationError(f"Reserved filename: {filename}")
+    # Check for reserved Windows filenames. The first-letter probe
+    # rules out most names before the stem is sliced and uppercased.
+    if filename[0] in _RESERVED_FIRST:
+        dot = filename.find(".")
+        name_without_ext = (filename if dot < 0 else filename[:dot]).upper()
+        if name_without_ext in _RESERVED_NAMES:
+            raise ValidationError(f"Reserved filename: {filename}")
 
     return True
 
 
+@lru_cache(maxsize=32)
+def _format_allowed(extensions: frozenset) -> str:
+    """Sorted, comma-joined extension list for error messages, memoized
+    so batch rejections against the same allowed set sort only once."""
+    return ", ".join(sorted(extensions))
+
+
 def validate_file_extension(
     filepath: Path,
     allowed_extensions: Optional[Set[str]] = None,
@@ -184,12 +227,18 @@ def validate_file_extension(
     if allowed_extensions and extension not in allowed_extensions:
         raise ValidationError(
             f"File type not allowed: {extension}. "
-            f"Allowed types: {', '.join(sorted(allowed_extensions))}"
+            f"Allowed types: {_format_allowed(frozenset(allowed_extensions))}"
         )
 
     return True
 
 
+# Longest-first so endswith can't be fooled by a shorter overlap; the
+# tupled form runs as one C loop of bounded memcmps and skips the
+# Path.suffix property walk entirely
+_SUPPORTED_SUFFIXES = tuple(sorted(SUPPORTED_EXTENSIONS, key=len, reverse=True))
+
+
 def is_supported_file_type(filepath: Path) -> bool:
     """
     Check if file type is supported by Alfred for analysis.
@@ -200,48 +249,18 @@ def is_supported_file_type(filepath: Path) -> bool:
     Returns:
         True if file type can be analyzed
     """
-    supported_extensions = {
-        # Documents
-        ".pdf",
-        ".doc",
-        ".docx",
-        ".txt",
-        ".rtf",
-        ".odt",
-        # Spreadsheets
-        ".xls",
-        ".xlsx",
-        ".csv",
-        ".ods",
-        # Presentations
-        ".ppt",
-        ".pptx",
-        ".odp",
-        # Images
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".bmp",
-        ".svg",
-        ".webp",
-        # Data files
-        ".json",
-        ".xml",
-        ".yaml",
-        ".yml",
-        # Archives (for extraction)
-        ".zip",
-        # Common formats
-        ".md",
-        ".log",
-    }
-
-    return filepath.suffix.lower() in supported_extensions
+    # A whole-name match is a dotfile like ".md" with no stem; those have
+    # no suffix in Path terms and were never treated as supported
+    name = filepath.name.lower()
+    return name.endswith(_SUPPORTED_SUFFIXES) and name not in SUPPORTED_EXTENSIONS
 
 
 def validate_directory_path(
-    dirpath: Path, must_exist: bool = False, must_be_writable: bool = True
+    dirpath: Path,
+    must_exist: bool = False,
+    must_be_writable: bool = True,
+    base: Optional[Path] = None,
+    strict: bool = False,
 ) -> bool:
     """
     Validate directory path for safety and accessibility.
@@ -250,6 +269,9 @@ def validate_directory_path(
         dirpath: Directory path to validate
         must_exist: If True, directory must already exist
         must_be_writable: If True, checks write permissions
+        base: If given, the resolved path must stay inside this directory
+        strict: If True, verify writability by actually creating a file
+            instead of trusting the permission bits
 
     Returns:
         True if valid
@@ -257,35 +279,75 @@ def validate_directory_path(
     Raises:
         ValidationError: If validation fails
     """
-    dirpath = Path(dirpath)
+    if not isinstance(dirpath, Path):
+        dirpath = Path(dirpath)
 
-    # Check for path traversal
+    # As in validate_file_path: reject ".." components outright, then
+    # resolve once and test containment
+    if ".." in dirpath.parts:
+        raise ValidationError("Path traversal detected")
     try:
         resolved = dirpath.resolve()
-        if ".." in str(dirpath):
-            raise ValidationError("Path traversal detected")
-    except Exception as e:
+    except OSError as e:
         raise ValidationError(f"Invalid directory path: {e}")
+    if base is not None and not resolved.is_relative_to(Path(base).resolve()):
+        raise ValidationError("Path traversal detected")
+
+    # One stat answers existence and type; the old exists()/is_dir()/
+    # exists() sequence issued three syscalls for the same inode
+    try:
+        st = os.stat(dirpath)
+    except OSError:
+        st = None
 
-    # Check existence
-    if must_exist and not dirpath.exists():
+    if must_exist and st is None:
         raise ValidationError(f"Directory does not exist: {dirpath}")
 
-    if dirpath.exists() and not dirpath.is_dir():
+    if st is not None and not stat.S_ISDIR(st.st_mode):
         raise ValidationError(f"Path is not a directory: {dirpath}")
 
-    # Check write permissions
-    if must_be_writable and dirpath.exists():
-        test_file = dirpath / ".alfred_write_test"
-        try:
-            test_file.touch()
-            test_file.unlink()
-        except Exception:
+    # Check write permissions. os.access is a single syscall; the old
+    # touch/unlink probe (create + delete + dirent churn) is kept behind
+    # strict=True for callers that need a TOCTOU-safe answer (e.g.
+    # read-only mounts where the permission bits lie).
+    if must_be_writable and st is not None:
+        if strict:
+            test_file = dirpath / ".alfred_write_test"
+            try:
+                test_file.touch()
+                test_file.unlink()
+            except Exception:
+                raise ValidationError(f"Directory is not writable: {dirpath}")
+        elif not os.access(dirpath, os.W_OK):
             raise ValidationError(f"Directory is not writable: {dirpath}")
 
     return True
 
 
+# MIME types for the extensions Alfred handles most, answered without
+# touching the mimetypes tables
+_FAST_MIME = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".txt": "text/plain",
+    ".json": "application/json",
+    ".html": "text/html",
+    ".js": "application/javascript",
+    ".css": "text/css",
+}
+
+
+@lru_cache(maxsize=256)
+def _guess_mime(extension: str) -> str:
+    """Resolve a lowercase suffix through mimetypes once, then cache."""
+    mime_type, _ = mimetypes.guess_type("f" + extension)
+    if mime_type:
+        return mime_type
+    return mimetypes.types_map.get(extension, "application/octet-stream")
+
+
 def validate_mime_type(
     filepath: Path, allowed_types: Optional[List[str]] = None
 ) -> bool:
@@ -302,15 +364,18 @@ def validate_mime_type(
     Raises:
         ValidationError: If MIME type is not allowed
     """
-    mime_type, _ = mimetypes.guess_type(str(filepath))
-
+    # Two-tier lookup: the handful of extensions Alfred sees constantly
+    # resolve from a small dict; everything else goes through a cached
+    # guess so the mimetypes table scan runs once per distinct suffix.
+    # Compound names fall back to the last two suffixes so guess_type's
+    # encoding handling still applies (.tar.gz -> application/x-tar).
+    extension = filepath.suffix.lower()
+    mime_type = _FAST_MIME.get(extension)
     if mime_type is None:
-        # Try to determine from extension
-        extension = filepath.suffix.lower()
-        if extension:
-            mime_type = mimetypes.types_map.get(extension, "application/octet-stream")
-        else:
-            mime_type = "application/octet-stream"
+        suffixes = filepath.suffixes
+        if len(suffixes) > 1:
+            extension = "".join(suffixes[-2:]).lower()
+        mime_type = _guess_mime(extension)
 
     if allowed_types and mime_type not in allowed_types:
         raise ValidationError(
@@ -336,45 +401,24 @@ def sanitize_filename(filename: str, replacement: str = "_") -> str:
     if not filename:
         return "unnamed"
 
-    # Replace path separators
-    filename = filename.replace("/", replacement)
-    filename = filename.replace("\\", replacement)
-
-    # Replace other dangerous characters
-    dangerous_chars = ["\0", "\n", "\r", "\t", ":", "*", "?", '"', "<", ">", "|"]
-    for char in dangerous_chars:
-        filename = filename.replace(char, replacement)
-
-    # Handle Windows reserved names
-    reserved_names = {
-        "CON",
-        "PRN",
-        "AUX",
-        "NUL",
-        "COM1",
-        "COM2",
-        "COM3",
-        "COM4",
-        "COM5",
-        "COM6",
-        "COM7",
-        "COM8",
-        "COM9",
-        "LPT1",
-        "LPT2",
-        "LPT3",
-        "LPT4",
-        "LPT5",
-        "LPT6",
-        "LPT7",
-        "LPT8",
-        "LPT9",
-    }
-
-    name_parts = filename.split(".")
-    if name_parts[0].upper() in reserved_names:
-        name_parts[0] = f"{replacement}{name_parts[0]}"
-        filename = ".".join(name_parts)
+    # Replace path separators and other dangerous characters in one
+    # pass: the precomputed translate table covers the default, and a
+    # compiled character class serves custom replacement strings
+    # without building a fresh table per call
+    if replacement == "_":
+        filename = filename.translate(_SANITIZE_TABLE)
+    else:
+        # Escape backslashes so re.sub treats the replacement as a
+        # literal string rather than a template ("\\1", "\\g<0>")
+        filename = _SANITIZE_RE.sub(replacement.replace("\\", r"\\"), filename)
+
+    # Handle Windows reserved names, gated on the same first-letter
+    # probe as validate_filename
+    if filename and filename[0] in _RESERVED_FIRST:
+        name_parts = filename.split(".")
+        if name_parts[0].upper() in _RESERVED_NAMES:
+            name_parts[0] = f"{replacement}{name_parts[0]}"
+            filename = ".".join(name_parts)
 
     # Remove leading/trailing spaces and dots
     filename = filename.strip(" .")
@@ -415,8 +459,7 @@ def validate_category_name(category: str) -> bool:
     if len(category) > 50:
         raise ValidationError("Category name too long (max 50 chars)")
 
-    # Only allow alphanumeric, spaces, underscores, and hyphens
-    if not re.match(r"^[\w\s\-]+$", category):
+    if not _CATEGORY_PATTERN.match(category):
         raise ValidationError(
             "Category name can only contain letters, numbers, spaces, "
             "underscores, and hyphens"
@@ -442,8 +485,10 @@ def validate_file_operation(
     Raises:
         ValidationError: If operation would be unsafe
     """
-    source = Path(source)
-    destination = Path(destination)
+    if not isinstance(source, Path):
+        source = Path(source)
+    if not isinstance(destination, Path):
+        destination = Path(destination)
 
     # Validate source
     validate_file_path(source, must_exist=True)
@@ -463,33 +508,103 @@ def validate_file_operation(
     return True
 
 
-def validate_batch_operation(files: List[Path], max_files: int = 100) -> bool:
+def validate_files(
+    files: Union[List[Path], List[os.DirEntry]],
+    max_files: int = 100,
+    max_size_mb: Optional[float] = None,
+    max_total_mb: int = MAX_BATCH_TOTAL_MB,
+) -> Dict[Path, os.stat_result]:
     """
-    Validate batch file operation isn't too large.
+    Validate a batch of files in one pass and return their stat results.
+
+    Stats each file exactly once, checking per-file and cumulative size
+    limits along the way. Callers can feed the returned stat_result back
+    into validate_file_size (or read st_size/st_mtime directly) instead
+    of re-statting every file downstream.
 
     Args:
-        files: List of file paths
+        files: List of file paths or scandir DirEntry objects
         max_files: Maximum number of files allowed
+        max_size_mb: Per-file size limit in MB (uses default if None)
+        max_total_mb: Cumulative size limit in MB
 
     Returns:
-        True if valid
+        Mapping of each path to its os.stat_result
 
     Raises:
-        ValidationError: If batch is too large
+        ValidationError: If the batch or any file exceeds its limit,
+            or a file does not exist
     """
     if len(files) > max_files:
         raise ValidationError(
             f"Too many files in batch: {len(files)} (max: {max_files})"
         )
+    if max_size_mb is None:
+        max_size_mb = MAX_FILE_SIZE_MB
+    max_file_bytes = max_size_mb * 1048576
+    max_total_bytes = max_total_mb * 1048576
 
-    # Check total size
-    total_size = sum(f.stat().st_size for f in files if f.exists())
-    max_total_mb = 500  # 500MB total
+    stats: Dict[Path, os.stat_result] = {}
+    total_size = 0
+    for f in files:
+        try:
+            st = f.stat() if isinstance(f, os.DirEntry) else os.stat(f)
+        except OSError:
+            raise ValidationError(f"File does not exist: {f}")
+        if st.st_size > max_file_bytes:
+            raise ValidationError(
+                f"File too large: {st.st_size / 1048576:.1f}MB "
+                f"(max: {max_size_mb}MB)"
+            )
+        total_size += st.st_size
+        if total_size > max_total_bytes:
+            raise ValidationError(
+                f"Batch too large: {total_size / 1048576:.1f}MB "
+                f"(max: {max_total_mb}MB)"
+            )
+        stats[Path(f)] = st
+
+    return stats
+
+
+def validate_batch_operation(
+    files: Union[List[Path], List[os.DirEntry]], max_files: int = 100
+) -> bool:
+    """
+    Validate batch file operation isn't too large.
 
-    if total_size > max_total_mb * 1024 * 1024:
+    Args:
+        files: List of file paths, or os.DirEntry objects from a scandir
+            walk (their cached stat is used, saving a syscall per file)
+        max_files: Maximum number of files allowed
+
+    Returns:
+        True if valid
+
+    Raises:
+        ValidationError: If batch is too large
+    """
+    if len(files) > max_files:
         raise ValidationError(
-            f"Batch too large: {total_size / 1024 / 1024:.1f}MB "
-            f"(max: {max_total_mb}MB)"
+            f"Too many files in batch: {len(files)} (max: {max_files})"
         )
 
+    # Check total size. One stat per file (exists + stat were two), and
+    # bail out as soon as the limit is crossed instead of statting the
+    # rest of an oversized batch.
+    total_size = 0
+    for f in files:
+        try:
+            # DirEntry.stat() answers from the scandir cache on most
+            # platforms; plain paths fall back to a real stat
+            st = f.stat() if isinstance(f, os.DirEntry) else os.stat(f)
+        except OSError:
+            continue
+        total_size += st.st_size
+        if total_size > _MAX_BATCH_TOTAL_BYTES:
+            raise ValidationError(
+                f"Batch too large: {total_size / 1024 / 1024:.1f}MB "
+                f"(max: {MAX_BATCH_TOTAL_MB}MB)"
+            )
+
     return True